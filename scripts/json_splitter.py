@@ -1,9 +1,39 @@
 #!/usr/bin/env python3
 
-import json
 import os
 import sys
 import click
+import ijson
+import orjson
+
+
+def fsync_directory(path):
+    """Flush a directory's entries (created and renamed files) to disk."""
+    dir_fd = os.open(path, os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def write_file(path, data):
+    """Write bytes to a file with unbuffered os.write calls."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def find_value_event(json_file, key_name):
+    """Return the first parse event for the value at key_name, or None if it is absent."""
+    with open(json_file, 'rb') as f:
+        for prefix, event, _ in ijson.parse(f):
+            if prefix == key_name:
+                return event
+    return None
 
 
 @click.command()
@@ -12,7 +42,8 @@ import click
 @click.argument('dest_dir', type=click.Path())
 @click.option('--id-key', default='id', help='Name of the ID field in each object (default: "id")')
 @click.option('--clean', is_flag=True, help='Delete and recreate the destination directory')
-def main(json_file, key_name, dest_dir, id_key, clean):
+@click.option('--verbose', is_flag=True, help='List every file created')
+def main(json_file, key_name, dest_dir, id_key, clean, verbose):
     """
     Process a JSON file by extracting objects from a specified key and saving each object
     to its own file named after its ID.
@@ -22,6 +53,7 @@ def main(json_file, key_name, dest_dir, id_key, clean):
     DEST_DIR: Directory where individual JSON files will be saved
     
     If --clean is specified, the destination directory will be deleted and recreated.
+    If --verbose is specified, every created file is listed.
     """
     try:
         # Handle the destination directory
@@ -33,44 +65,72 @@ def main(json_file, key_name, dest_dir, id_key, clean):
         # Create destination directory
         os.makedirs(dest_dir, exist_ok=True)
         
-        # Load the JSON file
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-        
-        # Check if the key exists in the JSON
-        if key_name not in data:
-            print(f"Error: Key '{key_name}' not found in the JSON file.")
-            sys.exit(1)
-        
-        # Get the array of objects
-        items = data[key_name]
-        
-        if not isinstance(items, list):
-            print(f"Error: '{key_name}' does not contain a list of objects.")
-            sys.exit(1)
-        
-        # Process each item
-        for i, item in enumerate(items):
-            # Check if the item has the ID key
-            if id_key not in item:
-                print(f"Warning: Item at index {i} does not have '{id_key}' key. Skipping.")
-                continue
+        # Stream the objects under the key so only one item is held in memory
+        # (ijson picks its fastest available backend, yajl2_c when built)
+        count = 0
+        pending = {}
+        try:
+            with open(json_file, 'rb') as f:
+                stream = ijson.items(f, f"{key_name}.item", use_float=True)
+                
+                # Process each item
+                for i, item in enumerate(stream):
+                    count += 1
+                    
+                    # Check if the item has the ID key
+                    if id_key not in item:
+                        print(f"Warning: Item at index {i} does not have '{id_key}' key. Skipping.")
+                        continue
+                    
+                    # Get the ID
+                    item_id = item[id_key]
+                    
+                    # Create the output file path
+                    output_file = os.path.join(dest_dir, f"{item_id}.json")
+                    
+                    # Write the item to a temporary file, moved into place below
+                    tmp_file = f"{output_file}.tmp"
+                    pending[output_file] = tmp_file
+                    write_file(tmp_file, orjson.dumps(item, option=orjson.OPT_INDENT_2))
             
-            # Get the ID
-            item_id = item[id_key]
+            # With at most one item, rescan up to the key to rule out a missing key or
+            # a non-list value (an object with an "item" key also yields one item)
+            if count <= 1:
+                event = find_value_event(json_file, key_name)
+                if event is None:
+                    print(f"Error: Key '{key_name}' not found in the JSON file.")
+                    sys.exit(1)
+                
+                if event != 'start_array':
+                    print(f"Error: '{key_name}' does not contain a list of objects.")
+                    sys.exit(1)
             
-            # Create the output file path
-            output_file = os.path.join(dest_dir, f"{item_id}.json")
-            
-            # Write the item to a new file
-            with open(output_file, 'w') as f:
-                json.dump(item, f, indent=2)
-            
-            print(f"Created: {output_file}")
+            # Sync all written data once, then atomically replace the final files
+            if pending:
+                os.sync()
+                for output_file, tmp_file in pending.items():
+                    os.replace(tmp_file, output_file)
+                fsync_directory(dest_dir)
+        except BaseException:
+            # Don't leave temp files behind for a later `git add -A` to pick up
+            for tmp_file in pending.values():
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+            raise
+        
+        if pending:
+            # Report created files in one write rather than one print per item
+            if verbose:
+                sys.stdout.flush()
+                sys.stdout.buffer.writelines(
+                    b"Created: " + output_file.encode() + b"\n" for output_file in pending
+                )
+                sys.stdout.buffer.flush()
+            print(f"Created {len(pending)} files in {dest_dir}")
         
-        print(f"Processed {len(items)} items from '{key_name}'")
+        print(f"Processed {count} items from '{key_name}'")
         
-    except json.JSONDecodeError:
+    except ijson.JSONError:
         print(f"Error: '{json_file}' is not a valid JSON file.")
         sys.exit(1)
     except Exception as e:
@@ -1,41 +1,63 @@
 #!/usr/bin/env python3
 
-import json
+import hashlib
 import os
 import subprocess
 import sys
 
-def load_current_json():
-    """Load the current version of index.json"""
+import orjson
+
+def load_current_bytes():
+    """Read the current version of index.json without parsing it"""
     try:
-        with open('washk12_jobs/index.json', 'r') as f:
-            return json.load(f)
-    except Exception as e:
+        with open('washk12_jobs/index.json', 'rb') as f:
+            return f.read()
+    except OSError as e:
         print(f"Error loading current index.json: {e}")
         return None
 
-def load_previous_json():
-    """Load the previous committed version of index.json"""
+def load_previous_bytes():
+    """Read the previous committed version of index.json without parsing it"""
     try:
         # Get the previous committed version using git show
         result = subprocess.run(
             ['git', 'show', 'HEAD~1:washk12_jobs/index.json'], 
             capture_output=True, 
-            text=True, 
             check=True
         )
-        return json.loads(result.stdout)
+        return result.stdout
     except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode(errors='replace')
         print(f"Error getting previous version: {e}")
-        print(f"stderr: {e.stderr}")
+        print(f"stderr: {stderr}")
         # If this is the first commit with this file, there's no previous version
-        if "fatal: path 'washk12_jobs/index.json' does not exist in 'HEAD~1'" in e.stderr:
+        if "fatal: path 'washk12_jobs/index.json' does not exist in 'HEAD~1'" in stderr:
             print("No previous version found - this appears to be the first commit with this file")
         return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing previous JSON: {e}")
+
+def parse_json(raw, label):
+    """Parse raw index.json bytes, returning None if they are missing or invalid"""
+    if raw is None:
+        return None
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError as e:
+        print(f"Error parsing {label} JSON: {e}")
         return None
 
+def index_changed():
+    """Check whether index.json differs between HEAD~1 and HEAD"""
+    # Exit code 0 means identical; 1 means changed, anything else is an error
+    result = subprocess.run(
+        ['git', 'diff', '--quiet', 'HEAD~1', 'HEAD', '--', 'washk12_jobs/index.json'],
+        capture_output=True
+    )
+    return result.returncode != 0
+
+def job_digest(job):
+    """Return a 16-byte digest of a job's canonical (sorted-key) JSON encoding"""
+    return hashlib.blake2b(orjson.dumps(job, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
 def compare_jobs(current_data, previous_data):
     """Compare current and previous job listings"""
     if not current_data or not previous_data:
@@ -49,16 +71,13 @@ def compare_jobs(current_data, previous_data):
     added_jobs = [job_id for job_id in current_jobs if job_id not in previous_jobs]
     removed_jobs = [job_id for job_id in previous_jobs if job_id not in current_jobs]
     
-    # For changed jobs, we need to compare the content
-    changed_jobs = []
-    for job_id in current_jobs:
-        if job_id in previous_jobs:
-            current_job = current_jobs[job_id]
-            previous_job = previous_jobs[job_id]
-            
-            # Compare the jobs (excluding any timestamp fields that might change regularly)
-            if current_job != previous_job:
-                changed_jobs.append(job_id)
+    # For changed jobs, compare content digests rather than walking nested dicts
+    current_hashes = {job_id: job_digest(job) for job_id, job in current_jobs.items()}
+    previous_hashes = {job_id: job_digest(job) for job_id, job in previous_jobs.items()}
+    changed_jobs = [
+        job_id for job_id in current_hashes
+        if job_id in previous_hashes and current_hashes[job_id] != previous_hashes[job_id]
+    ]
     
     # Print summary
     print(f"Job Changes Summary:")
@@ -87,8 +106,20 @@ def compare_jobs(current_data, previous_data):
 
 def main():
     print("Analyzing job changes...")
-    current_data = load_current_json()
-    previous_data = load_previous_json()
+    if not index_changed():
+        print("No changes to washk12_jobs/index.json since the previous commit")
+        return
+    
+    current_bytes = load_current_bytes()
+    previous_bytes = load_previous_bytes()
+    
+    # Identical bytes need no parsing or job-by-job comparison
+    if current_bytes is not None and current_bytes == previous_bytes:
+        print("No changes - current and previous index.json are identical")
+        return
+    
+    current_data = parse_json(current_bytes, 'current')
+    previous_data = parse_json(previous_bytes, 'previous')
     
     if current_data and previous_data:
         compare_jobs(current_data, previous_data)
@@ -9,117 +9,237 @@ Use --index to save as index.json (overwriting any existing file).
 """
 
 import re
-import json
 import time
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import repeat
 
+import orjson
 import requests
 from bs4 import BeautifulSoup
+from lxml import html
+from lxml.etree import XPath
+from selectolax.lexbor import LexborHTMLParser
 
 # Check command line arguments
 DEBUG = "--debug" in sys.argv
 INDEX_MODE = "--index" in sys.argv
 
+# Response validators (ETag/Last-Modified) kept between --index runs
+HTTP_CACHE_FILE = os.path.join("washk12_jobs", ".http_cache.json")
+INDEX_FILE = os.path.join("washk12_jobs", "index.json")
 
-def extract_job_details(html_content, index):
+# Descriptions longer than this are truncated with "..."
+DESCRIPTION_LIMIT = 500
+
+# Precompiled XPath expressions for the per-job extraction
+XP_TITLE = XPath("(.//table[@class='title'])[1]//td[@id='wrapword']")
+XP_JOBID_TEXT = XPath(".//text()[contains(., 'JobID:')]")
+XP_APPLY = XPath(".//input[@value=' Apply ' and @class='screenOnly ApplyButton']/@onclick")
+XP_LABEL_SPANS = XPath(".//span[@class='label']")
+XP_DESC = XPath(".//span[starts-with(@id, 'DescriptionText')]")
+XP_SPANS = XPath(".//span")
+XP_ATTACH = XPath("(.//div[@class='AppliTrackJobPostingAttachments'])[1]//a")
+# Text nodes as seen by BeautifulSoup's get_text (no script/style contents)
+XP_TEXT = XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+# Precompiled regex patterns (fallback field labels get one named group each,
+# inside a lookahead so overlapping labels like "Closing Date Available" are all found)
+_FIELD_LABEL_RE = re.compile(
+    r"(?=(?:(?P<position_type>Position Type)|(?P<location>Location)|(?P<date_posted>Date Posted)"
+    r"|(?P<closing_date>Closing Date)|(?P<date_available>Date Available)|(?P<status>Status)"
+    r"|(?P<requirements>Minimum Requirements)|(?P<salary>Salary)"
+    r"|(?P<endorsements>Endorsements?)|(?P<license>License Requirements?)))"
+)
+_FIELD_VALUE_RE = re.compile(r":?\s*(.*?)(?:\n|$)")
+_JOBID_RE = re.compile(r"JobID:\s*(\d+)")
+_APPLYFOR_RE = re.compile(r"applyFor\('(\d+)'")
+_FTE_RE = re.compile(r"(\d+(?:\.\d+)?\s*FTE)", re.I)
+_DOCWRITE_RE = re.compile(r"document\.write\('(.*?)'\);", re.DOTALL)
+_ESCAPED_QUOTE_RE = re.compile(r"\\(['\"])")
+_SALARY_MENTION_RE = re.compile(r"salary schedule|salary is", re.I)
+_ENDORSEMENT_MENTION_RE = re.compile(r"endorsements?", re.I)
+_LICENSE_MENTION_RE = re.compile(r"license", re.I)
+
+
+@dataclass(slots=True)
+class Job:
+    """A single job posting extracted from the listings page."""
+    job_id: str
+    title: str
+    position_type: str
+    location: str
+    date_posted: str
+    date_available: str
+    closing_date: str
+    status: str
+    minimum_requirements: str
+    salary_information: str
+    description: str
+    attachments: list
+    url: str
+    # Optional fields, only written out when they have values
+    fte: str = ""
+    endorsements_required: str = ""
+    license_requirements: str = ""
+    
+    def as_dict(self):
+        """Return the job as a dictionary in output order, omitting empty optional fields."""
+        data = {
+            "job_id": self.job_id,
+            "title": self.title,
+            "position_type": self.position_type,
+            "location": self.location,
+            "date_posted": self.date_posted,
+            "date_available": self.date_available,
+            "closing_date": self.closing_date,
+            "status": self.status,
+            "minimum_requirements": self.minimum_requirements,
+            "salary_information": self.salary_information,
+            "description": self.description,
+            "attachments": self.attachments,
+            "url": self.url,
+        }
+        if self.fte:
+            data["fte"] = self.fte
+        if self.endorsements_required:
+            data["endorsements_required"] = self.endorsements_required
+        if self.license_requirements:
+            data["license_requirements"] = self.license_requirements
+        return data
+
+
+def _json_default(obj):
+    """Serialize Job records for orjson, which passes dataclasses through to here."""
+    if isinstance(obj, Job):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def get_text(element, limit=None):
+    """Return the stripped text of an element, joined like get_text(strip=True).
+
+    With a limit, stop collecting text once it is longer than limit characters.
+    """
+    if limit is None:
+        return ''.join(text.strip() for text in XP_TEXT(element))
+    
+    parts = []
+    length = 0
+    for text in XP_TEXT(element):
+        text = text.strip()
+        parts.append(text)
+        length += len(text)
+        if length > limit:
+            break
+    return ''.join(parts)
+
+
+def extract_job_details(html_content, index, output_dir="washk12_jobs", debug=False):
     """Extract job details from HTML content."""
     # Save individual job HTML for debugging if it's one of the first few jobs
-    if DEBUG and index <= 3:
-        # Create washk12_jobs directory if it doesn't exist
-        output_dir = "washk12_jobs"
-        os.makedirs(output_dir, exist_ok=True)
-        
+    # (the caller creates output_dir)
+    if debug and index <= 3:
         job_html_filename = os.path.join(output_dir, f"job_{index}_raw.html")
         with open(job_html_filename, 'w', encoding='utf-8') as f:
             f.write(html_content)
     
     # Parse HTML
-    soup = BeautifulSoup(html_content, 'lxml')
-    
-    # Get text content
-    all_text = soup.get_text(strip=True)
+    root = html.fromstring(html_content)
     
     # Extract job title from table.title
     title = ""
-    title_table = soup.find('table', class_='title')
-    if title_table and title_table.find('td', id='wrapword'):
-        title = title_table.find('td', id='wrapword').get_text(strip=True)
+    title_cells = XP_TITLE(root)
+    if title_cells:
+        title = get_text(title_cells[0])
     
     # Extract job ID from the JobID text or apply button
     job_id = f"job_{index}"
     
     # Method 1: Look for JobID in text
-    job_id_span = soup.find(string=lambda text: text and 'JobID:' in text)
-    if job_id_span:
-        job_id_match = re.search(r'JobID:\s*(\d+)', job_id_span)
+    job_id_texts = XP_JOBID_TEXT(root)
+    if job_id_texts:
+        job_id_match = _JOBID_RE.search(job_id_texts[0])
         if job_id_match:
             job_id = job_id_match.group(1)
     
     # Method 2: Look for apply button
-    apply_button = soup.find('input', {'value': ' Apply ', 'class': 'screenOnly ApplyButton'})
-    if apply_button and 'onclick' in apply_button.attrs:
-        onclick = apply_button['onclick']
-        id_match = re.search(r"applyFor\('(\d+)'", onclick)
+    apply_onclicks = XP_APPLY(root)
+    if apply_onclicks:
+        id_match = _APPLYFOR_RE.search(apply_onclicks[0])
         if id_match:
             job_id = id_match.group(1)
     
-    # Look for span elements with class 'label' for field names
+    # Collect labeled fields in a single walk over the li elements
     fields = {}
-    
-    # Find all span elements with class 'label'
-    label_spans = soup.find_all('span', class_='label')
-    
-    # Find all li elements that contain label spans
-    list_items = soup.find_all('li')
-    for li in list_items:
-        label_span = li.find('span', class_='label')
-        if label_span:
-            field_name = label_span.get_text(strip=True).replace(':', '')
-            # Find normal spans within this li
-            normal_spans = li.find_all('span', class_='normal')
-            if normal_spans:
-                # Combine all normal spans text
-                field_value = ' '.join(span.get_text(strip=True) for span in normal_spans)
-                fields[field_name] = field_value
+    for li in root.iter('li'):
+        label_span = li.find(".//span[@class='label']")
+        if label_span is None:
+            continue
+        # Find normal spans within this li
+        normal_spans = li.findall(".//span[@class='normal']")
+        if normal_spans:
+            # Combine all normal spans text
+            field_name = get_text(label_span).replace(':', '')
+            field_value = ' '.join(get_text(span) for span in normal_spans)
+            fields[field_name] = field_value
+    
+    # Only materialize the full text when a field has to fall back to regex
+    all_text = None
+    
+    def _text():
+        nonlocal all_text
+        if all_text is None:
+            all_text = get_text(root)
+        return all_text
+    
+    text_fields = None
+    
+    def _text_field(name):
+        nonlocal text_fields
+        if text_fields is None:
+            text_fields = extract_text_fields(_text())
+        return text_fields.get(name, "")
     
     # Extract common job fields from the fields dictionary or using regex
     position_type = fields.get('Position Type', '')
     if not position_type:
-        position_type = extract_field(all_text, r'Position Type:?\s*(.*?)(?:\n|$)')
+        position_type = _text_field('position_type')
     
     location = fields.get('Location', '')
     if not location:
-        location = extract_field(all_text, r'Location:?\s*(.*?)(?:\n|$)')
+        location = _text_field('location')
     
     date_posted = fields.get('Date Posted', '')
     if not date_posted:
-        date_posted = extract_field(all_text, r'Date Posted:?\s*(.*?)(?:\n|$)')
+        date_posted = _text_field('date_posted')
     
     closing_date = fields.get('Closing Date', '')
     if not closing_date:
-        closing_date = extract_field(all_text, r'Closing Date:?\s*(.*?)(?:\n|$)')
+        closing_date = _text_field('closing_date')
     
     # Look for additional fields
     date_available = fields.get('Date Available', '')
     if not date_available:
-        date_available = extract_field(all_text, r'Date Available:?\s*(.*?)(?:\n|$)')
+        date_available = _text_field('date_available')
     
     status = fields.get('Status', '')
     if not status:
-        status = extract_field(all_text, r'Status:?\s*(.*?)(?:\n|$)')
+        status = _text_field('status')
     
     requirements = fields.get('Minimum Requirements', '')
     if not requirements:
-        requirements = extract_field(all_text, r'Minimum Requirements:?\s*(.*?)(?:\n|$)')
+        requirements = _text_field('requirements')
     
     salary_info = fields.get('Salary', '')
     if not salary_info:
-        salary_info = extract_field(all_text, r'Salary:?\s*(.*?)(?:\n|$)')
+        salary_info = _text_field('salary')
         if not salary_info:
             # Look for salary schedule mentions
-            salary_match = re.search(r'salary schedule|salary is', all_text, re.IGNORECASE)
+            salary_match = _SALARY_MENTION_RE.search(_text())
             if salary_match:
                 # Extract a reasonable amount of text around the salary mention
                 start = max(0, salary_match.start() - 50)
@@ -129,17 +249,17 @@ def extract_job_details(html_content, index):
     # Extract FTE if available
     fte = fields.get('FTE', '')
     if not fte and status:
-        fte_match = re.search(r'(\d+(?:\.\d+)?\s*FTE)', status, re.IGNORECASE)
+        fte_match = _FTE_RE.search(status)
         if fte_match:
             fte = fte_match.group(1)
     
     # Extract endorsements and license requirements
     endorsements = fields.get('Endorsements Required', '')
     if not endorsements:
-        endorsements = extract_field(all_text, r'Endorsements?:?\s*(.*?)(?:\n|$)')
+        endorsements = _text_field('endorsements')
         if not endorsements and requirements:
             # Look for endorsement mentions in requirements
-            end_match = re.search(r'endorsements?', requirements, re.IGNORECASE)
+            end_match = _ENDORSEMENT_MENTION_RE.search(requirements)
             if end_match:
                 # Extract a reasonable amount of text around the endorsement mention
                 start = max(0, end_match.start() - 20)
@@ -148,10 +268,10 @@ def extract_job_details(html_content, index):
     
     license_req = fields.get('License Requirements', '')
     if not license_req:
-        license_req = extract_field(all_text, r'License Requirements?:?\s*(.*?)(?:\n|$)')
+        license_req = _text_field('license')
         if not license_req and requirements:
             # Look for license mentions in requirements
-            lic_match = re.search(r'license', requirements, re.IGNORECASE)
+            lic_match = _LICENSE_MENTION_RE.search(requirements)
             if lic_match:
                 # Extract a reasonable amount of text around the license mention
                 start = max(0, lic_match.start() - 20)
@@ -162,9 +282,9 @@ def extract_job_details(html_content, index):
     description = ""
     
     # Method 1: Look for span with ID starting with DescriptionText
-    desc_span = soup.find('span', id=lambda x: x and x.startswith('DescriptionText'))
-    if desc_span:
-        description = desc_span.get_text(strip=True)
+    desc_spans = XP_DESC(root)
+    if desc_spans:
+        description = get_text(desc_spans[0], limit=DESCRIPTION_LIMIT)
     
     # Method 2: Look for Additional Information in fields
     elif 'Additional Information' in fields:
@@ -173,29 +293,33 @@ def extract_job_details(html_content, index):
     # Method 3: Look for any span that might contain a description
     else:
         # Find spans that might contain a job description
-        for span in soup.find_all('span'):
+        for span in XP_SPANS(root):
             if span.get('id') and 'Text' in span.get('id'):
-                span_text = span.get_text(strip=True)
+                span_text = get_text(span, limit=DESCRIPTION_LIMIT)
                 if len(span_text) > 100:  # Likely a description if it's long
                     description = span_text
                     break
     
     # Find attachments
     attachments = []
-    attachments_div = soup.find('div', class_='AppliTrackJobPostingAttachments')
-    if attachments_div:
-        for link in attachments_div.find_all('a'):
-            attachments.append({
-                'text': link.get_text(strip=True),
-                'url': link.get('href', '')
-            })
-    
-    # Print debug info for the first few jobs
-    if DEBUG and index <= 3:
+    for link in XP_ATTACH(root):
+        attachments.append({
+            'text': get_text(link),
+            'url': link.get('href', '')
+        })
+    
+    # Print debug info for the first few jobs (compiled out under python -O)
+    if __debug__ and debug and index <= 3:
+        label_spans = XP_LABEL_SPANS(root)
         print(f"\nDebug info for job {index}:")
         print(f"  Title: {title}")
         print(f"  Job ID: {job_id}")
+        print(f"  Position Type: {position_type}")
+        print(f"  Location: {location}")
+        print(f"  Date Posted: {date_posted}")
+        print(f"  Closing Date: {closing_date}")
         print(f"  Found {len(label_spans)} label spans")
+        print(f"  Found {len(fields)} fields")
         print(f"  Fields extracted: {list(fields.keys())}")
         print(f"  Has description: {'Yes' if description else 'No'}")
         print(f"  Has attachments: {'Yes' if attachments else 'No'}")
@@ -204,62 +328,68 @@ def extract_job_details(html_content, index):
         if label_spans:
             print("  Sample label spans:")
             for i, span in enumerate(label_spans[:3]):
-                print(f"    {i+1}. {span.get_text(strip=True)}")
-    
-    # Create job data dictionary with all available fields
-    job_data = {
-        "job_id": job_id,
-        "title": title,
-        "position_type": position_type,
-        "location": location,
-        "date_posted": date_posted,
-        "date_available": date_available,
-        "closing_date": closing_date,
-        "status": status,
-        "minimum_requirements": requirements,
-        "salary_information": salary_info,
-        "description": description[:500] + ("..." if len(description) > 500 else ""),
-        "attachments": attachments,
-        "url": f"https://www.applitrack.com/washk12/onlineapp/default.aspx?AppliTrackJobId={job_id}" 
-               if not job_id.startswith('job_') else 
-               f"https://www.applitrack.com/washk12/onlineapp/default.aspx?all=1"
-    }
-    
-    # Add optional fields if they have values
-    if fte:
-        job_data["fte"] = fte
-    
-    if endorsements:
-        job_data["endorsements_required"] = endorsements
-    
-    if license_req:
-        job_data["license_requirements"] = license_req
-    
-    # Print debug info for the first few jobs
-    if DEBUG and index <= 3:
-        print(f"\nDebug info for job {index}:")
-        print(f"  Title: {title}")
-        print(f"  Job ID: {job_id}")
-        print(f"  Position Type: {position_type}")
-        print(f"  Location: {location}")
-        print(f"  Date Posted: {date_posted}")
-        print(f"  Closing Date: {closing_date}")
-        print(f"  Found {len(fields)} fields")
-        print(f"  Fields: {', '.join(fields.keys())}")
-        print(f"  Has description: {'Yes' if description else 'No'}")
-        print(f"  Has attachments: {'Yes' if attachments else 'No'}")
-    
-    return job_data
+                print(f"    {i+1}. {get_text(span)}")
+    
+    # Create the job record with all available fields
+    return Job(
+        job_id=job_id,
+        title=title,
+        position_type=position_type,
+        location=location,
+        date_posted=date_posted,
+        date_available=date_available,
+        closing_date=closing_date,
+        status=status,
+        minimum_requirements=requirements,
+        salary_information=salary_info,
+        description=(description if len(description) <= DESCRIPTION_LIMIT
+                     else description[:DESCRIPTION_LIMIT] + "..."),
+        attachments=attachments,
+        url=f"https://www.applitrack.com/washk12/onlineapp/default.aspx?AppliTrackJobId={job_id}" 
+            if not job_id.startswith('job_') else 
+            f"https://www.applitrack.com/washk12/onlineapp/default.aspx?all=1",
+        fte=fte,
+        endorsements_required=endorsements,
+        license_requirements=license_req,
+    )
 
 
-def extract_field(text, pattern):
-    """Extract a field from text using regex."""
-    match = re.search(pattern, text)
-    return match.group(1).strip() if match else ""
+def extract_text_fields(text):
+    """Extract the value after the first occurrence of each field label in one scan."""
+    values = {}
+    for match in _FIELD_LABEL_RE.finditer(text):
+        name = match.lastgroup
+        if name not in values:
+            values[name] = _FIELD_VALUE_RE.match(text, match.end(name)).group(1).strip()
+            if len(values) == len(_FIELD_LABEL_RE.groupindex):
+                break
+    return values
+
+
+def load_http_cache():
+    """Load the response validators saved by the previous index run."""
+    try:
+        with open(HTTP_CACHE_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+
+def save_http_cache(validators):
+    """Save response validators so the next run can make a conditional request."""
+    if not validators:
+        return
+    
+    with open(HTTP_CACHE_FILE, 'wb') as f:
+        f.write(orjson.dumps(validators, option=orjson.OPT_INDENT_2))
 
 
 def download_jobs():
-    """Download job postings and extract details."""
+    """Download job postings and extract details.
+
+    Returns (jobs, validators, raw_html); jobs and raw_html are None when the
+    server reports the listings as not modified since the last index run.
+    """
     print("Downloading Washington County School District job listings...")
     
     url = "https://www.applitrack.com/washk12/onlineapp/jobpostings/Output.asp?all=1&"
@@ -269,14 +399,37 @@ def download_jobs():
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
     }
     
+    # Send the validators from the last index run so an unchanged page returns 304,
+    # but only while the index.json they describe still exists
+    cache = load_http_cache() if INDEX_MODE and os.path.exists(INDEX_FILE) else {}
+    if cache.get('etag'):
+        headers['If-None-Match'] = cache['etag']
+    if cache.get('last_modified'):
+        headers['If-Modified-Since'] = cache['last_modified']
+    
     # Download content
-    response = requests.get(url, headers=headers)
+    with requests.Session() as session:
+        session.headers.update(headers)
+        response = session.get(url)
+    
+    if response.status_code == 304:
+        print("Job listings have not changed since the last run")
+        return None, cache, None
+    
     content = response.text
+    validators = {
+        key: value
+        for key, value in (
+            ('etag', response.headers.get('ETag')),
+            ('last_modified', response.headers.get('Last-Modified')),
+        )
+        if value
+    }
     
     # Save raw content to file for debugging
+    output_dir = "washk12_jobs"
     if DEBUG:
-        # Create washk12_jobs directory if it doesn't exist
-        output_dir = "washk12_jobs"
+        # Create washk12_jobs directory once, before any per-job debug output
         os.makedirs(output_dir, exist_ok=True)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -285,12 +438,11 @@ def download_jobs():
             f.write(content)
         print(f"Saved raw HTML content to {raw_filename} for debugging")
     
-    # Extract all document.write statements from the scripts
-    doc_writes = re.findall(r'document\.write\(\'(.*?)\'\);', content, re.DOTALL)
-    
-    # Combine all document.write contents into a single HTML string
-    combined_html = ''.join(doc_writes)
-    combined_html = combined_html.replace("\\'", "'").replace('\\"', '"')
+    # Combine the contents of all document.write statements into a single HTML string
+    combined_html = ''.join(m.group(1) for m in _DOCWRITE_RE.finditer(content))
+    if '\\' in combined_html:
+        # Unescape \' and \" in one pass
+        combined_html = _ESCAPED_QUOTE_RE.sub(r'\1', combined_html)
     
     # Save the combined HTML for debugging
     if DEBUG:
@@ -299,39 +451,62 @@ def download_jobs():
             f.write(combined_html)
     
     # Parse the combined HTML
-    soup = BeautifulSoup(combined_html, 'lxml')
+    tree = LexborHTMLParser(combined_html)
     
     # Find all job listings - they typically have a table with class 'title'
     job_blocks = []
     
     # Find all tables with class 'title' - these contain job titles and IDs
-    title_tables = soup.find_all('table', class_='title')
-    
-    for table in title_tables:
+    for table in tree.css('table.title'):
         # Find the parent ul.postingsList that contains the full job listing
-        parent_ul = table.find_parent('ul', class_='postingsList')
-        if parent_ul:
-            job_blocks.append(str(parent_ul))
+        parent_ul = table.parent
+        while parent_ul is not None and not (
+            parent_ul.tag == 'ul'
+            and 'postingsList' in (parent_ul.attributes.get('class') or '').split()
+        ):
+            parent_ul = parent_ul.parent
+        if parent_ul is not None:
+            job_blocks.append(parent_ul.html)
     
     print(f"Found {len(job_blocks)} job postings")
     
     if not job_blocks:
         print("No job postings found.")
-        return []
+        return [], validators, content
     
     print(f"Found {len(job_blocks)} job postings")
     
-    # Process job postings
+    # Process job postings in parallel; each posting is parsed independently
     jobs = []
-    for i, block in enumerate(job_blocks, 1):
-        job_data = extract_job_details(block, i)
-        jobs.append(job_data)
-        
-        # Log progress sparingly
-        if i == 1 or i == len(job_blocks) or i % 25 == 0:
-            print(f"Processed {i}/{len(job_blocks)} jobs")
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(
+            extract_job_details,
+            job_blocks,
+            range(1, len(job_blocks) + 1),
+            repeat(output_dir),
+            repeat(DEBUG),
+            chunksize=8,
+        )
+        for i, job_data in enumerate(results, 1):
+            jobs.append(job_data)
+            
+            # Log progress sparingly
+            if i == 1 or i == len(job_blocks) or i % 25 == 0:
+                print(f"Processed {i}/{len(job_blocks)} jobs")
     
-    return jobs
+    return jobs, validators, content
+
+
+def write_file(filename, data):
+    """Write bytes to a file with unbuffered os.write calls and fsync it."""
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 def save_jobs_to_json(jobs):
@@ -350,7 +525,7 @@ def save_jobs_to_json(jobs):
     
     # Determine filename based on INDEX_MODE flag
     if INDEX_MODE:
-        filename = os.path.join(output_dir, "index.json")
+        filename = INDEX_FILE
     else:
         # Add time to filename when not in index mode
         time_str = timestamp.strftime("%H-%M-%S")
@@ -364,8 +539,11 @@ def save_jobs_to_json(jobs):
     }
     
     # Save to file
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    write_file(filename, orjson.dumps(
+        data,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_PASSTHROUGH_DATACLASS,
+        default=_json_default,
+    ))
     
     return filename
 
@@ -394,7 +572,7 @@ def analyze_html_structure(html_content):
         print(f"  Found {len(found)} {name} elements")
     
     # Check for document.write patterns
-    doc_writes = re.findall(r'document\.write\(\'(.*?)\'\);', html_content, re.DOTALL)
+    doc_writes = _DOCWRITE_RE.findall(html_content)
     print(f"  Found {len(doc_writes)} document.write statements")
     
     # Check for script tags
@@ -419,22 +597,15 @@ def main():
     if INDEX_MODE:
         print("Running in INDEX mode - output will be saved as index.json")
     
-    jobs = download_jobs()
+    jobs, validators, raw_html = download_jobs()
+    if jobs is None:
+        print("No changes - keeping existing job data")
+        return
     
-    # Try to analyze the raw HTML structure
+    # Try to analyze the raw HTML structure already downloaded above
     if DEBUG:
         try:
-            # Create washk12_jobs directory if it doesn't exist
-            output_dir = "washk12_jobs"
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Find the most recent raw HTML file in the washk12_jobs directory
-            raw_files = [f for f in os.listdir(output_dir) if f.startswith('washk12_raw_') and f.endswith('.html')]
-            if raw_files:
-                latest_file = os.path.join(output_dir, max(raw_files))
-                with open(latest_file, 'r', encoding='utf-8') as f:
-                    raw_html = f.read()
-                    analyze_html_structure(raw_html)
+            analyze_html_structure(raw_html)
         except Exception as e:
             print(f"Could not analyze HTML structure: {e}")
     
@@ -442,7 +613,7 @@ def main():
         # Print a sample job to verify fields
         if DEBUG and len(jobs) > 0:
             print("\nSample job data:")
-            sample_job = jobs[0]
+            sample_job = jobs[0].as_dict()
             for key, value in sample_job.items():
                 if key == "text_content" and len(value) > 100:
                     print(f"  {key}: {value[:100]}...")
@@ -452,6 +623,10 @@ def main():
         
         filename = save_jobs_to_json(jobs)
         print(f"Successfully saved {len(jobs)} jobs to {filename}")
+        
+        # Only remember the validators once the data they describe is saved
+        if INDEX_MODE:
+            save_http_cache(validators)
     else:
         print("No jobs found.")
 